@@ -1,31 +1,39 @@
 # agents/embedding_agent.py
-import os
 import uuid
-from typing import List, Dict, Optional
-from sentence_transformers import SentenceTransformer
+from typing import Iterable, Optional
+from agents.issues import IssueBatch
+from agents.encoders import Encoder, SentenceTransformerEncoder
+from agents.vector_store import VectorStore, ChromaVectorStore
 
 class EmbeddingAgent:
     def __init__(
         self,
-        issues: List[Dict],
-        chroma_client,
+        issues: Iterable,
+        chroma_client=None,
         collection_name: str = "roslynator_issues",
         repo_root: Optional[str] = None,
+        vector_store: Optional[VectorStore] = None,
+        batch_size: int = 64,
+        encoder: Optional[Encoder] = None,
+        encode_chunk_size: int = 4096,
     ):
-        if chroma_client is None:
-            raise ValueError("chroma_client must be provided")
-        self.issues = issues if isinstance(issues, list) else []
-        self.chroma_client = chroma_client
+        if vector_store is None:
+            if chroma_client is None:
+                raise ValueError("chroma_client or vector_store must be provided")
+            vector_store = ChromaVectorStore(chroma_client, collection_name)
+        # Issue records (or legacy dicts) are packed into columns for bulk work
+        if isinstance(issues, IssueBatch):
+            self.issues = issues
+        else:
+            self.issues = IssueBatch.from_issues(issues if isinstance(issues, list) else [])
+        self.vector_store = vector_store
         self.collection_name = collection_name
         self.repo_root = repo_root
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
-
-    def _abs_path(self, file_path: str) -> str:
-        if not file_path:
-            return ""
-        if self.repo_root and not os.path.isabs(file_path):
-            return os.path.abspath(os.path.join(self.repo_root, file_path))
-        return os.path.abspath(file_path)
+        self.batch_size = batch_size
+        # Texts handed to the encoder per call. Kept large so a multi-process
+        # encoder can fan out; batch_size still sizes model and store batches.
+        self.encode_chunk_size = max(encode_chunk_size, batch_size)
+        self.encoder = encoder if encoder is not None else SentenceTransformerEncoder()
 
     def store_embeddings(self, clear_existing: bool = False) -> int:
         if not self.issues:
@@ -33,58 +41,56 @@ class EmbeddingAgent:
             return 0
 
         if clear_existing:
-            try:
-                self.chroma_client.delete_collection(self.collection_name)
-            except Exception:
-                pass
-
-        collection = self.chroma_client.get_or_create_collection(self.collection_name)
+            self.vector_store.reset()
 
-        existing_ids = set()
-        if collection.count() > 0:
-            got = collection.get(include=["ids"])
-            ids_field = got.get("ids", [])
-            for item in ids_field:
-                if isinstance(item, list):
-                    existing_ids.update(item)
-                else:
-                    existing_ids.add(item)
+        existing_ids = self.vector_store.existing_ids()
 
-        inserted = 0
-        for issue in self.issues:
-            rule = issue.get("id") or issue.get("ruleId") or str(uuid.uuid4())
-            file_rel = issue.get("file", "")
-            file_abs = self._abs_path(file_rel)
-            line = issue.get("line", -1)
-            unique_key = f"{rule}:{file_abs}:{line}"
+        # a resolved copy; the caller's batch is left as it was given
+        batch = self.issues.resolve_paths(self.repo_root)
 
+        # Only row numbers, rule ids and keys are kept for the whole run;
+        # documents and metadata dicts are built per encoder chunk.
+        rows, rules, ids = [], [], []
+        for i in range(len(batch)):
+            rule = batch.ids[i] or str(uuid.uuid4())
+            unique_key = f"{rule}:{batch.files[i]}:{batch.lines[i]}"
             if unique_key in existing_ids:
                 continue
+            existing_ids.add(unique_key)
+            rows.append(i)
+            rules.append(rule)
+            ids.append(unique_key)
 
-            metadata = {
-                "file": file_abs,
-                "line": line,
-                "column": issue.get("column", -1),
-                "severity": issue.get("severity", ""),
-                "id": rule,
-                "issue": issue.get("issue") or issue.get("message", ""),
-            }
-
-            document_text = (
-                f"Issue {metadata['id']} in file {metadata['file']} line {metadata['line']}. "
-                f"Severity: {metadata['severity']}. "
-                f"Message: {metadata['issue']}"
-            )
-
-            embedding = self.model.encode([document_text])[0].tolist()
+        for chunk_start in range(0, len(rows), self.encode_chunk_size):
+            chunk_end = chunk_start + self.encode_chunk_size
+            metadatas, documents = [], []
+            for i, rule in zip(rows[chunk_start:chunk_end], rules[chunk_start:chunk_end]):
+                metadata = {
+                    "file": batch.files[i],
+                    "line": batch.lines[i],
+                    "column": batch.columns[i],
+                    "severity": batch.severities[i],
+                    "id": rule,
+                    "issue": batch.messages[i],
+                }
+                metadatas.append(metadata)
+                documents.append(
+                    f"Issue {metadata['id']} in file {metadata['file']} line {metadata['line']}. "
+                    f"Severity: {metadata['severity']}. "
+                    f"Message: {metadata['issue']}"
+                )
 
-            collection.add(
-                documents=[document_text],
-                metadatas=[metadata],
-                ids=[unique_key],
-                embeddings=[embedding],
-            )
-            inserted += 1
+            embeddings = self.encoder.encode(documents, batch_size=self.batch_size)
+            chunk_ids = ids[chunk_start:chunk_end]
+            for start in range(0, len(documents), self.batch_size):
+                end = start + self.batch_size
+                self.vector_store.add(
+                    ids=chunk_ids[start:end],
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    embeddings=embeddings[start:end],
+                )
 
+        inserted = len(ids)
         print(f"[EmbeddingAgent] Stored {inserted} new issues (duplicates skipped).")
         return inserted
@@ -0,0 +1,144 @@
+# agents/encoders.py
+import os
+import platform
+from typing import List, Optional
+
+import numpy as np
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class Encoder:
+    """
+    Turns texts into unit-length float32 vectors for the vector store.
+
+    min_cosine is the lowest cosine similarity an encoder must keep against
+    the reference SentenceTransformer vectors for the same text, so its
+    output can be mixed with an existing all-MiniLM-L6-v2 collection.
+    benchmarks/bench_encoders.py checks it; see the readme for measurements.
+    """
+
+    name = "base"
+    min_cosine = 1.0
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SentenceTransformerEncoder(Encoder):
+    name = "default"
+    min_cosine = 0.9999
+
+    def __init__(self, model_name: str = MODEL_NAME, **model_kwargs):
+        # Imported here: sentence_transformers pulls in torch, which dominates startup time.
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, **model_kwargs)
+
+    def encode(self, texts, batch_size: int = 64) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True),
+            dtype=np.float32,
+        )
+
+
+class MultiProcessEncoder(SentenceTransformerEncoder):
+    """
+    Spreads encoding over a pool of CPU worker processes. Small inputs (such
+    as a single search query) are encoded in-process, since shipping them to
+    the pool costs more than it saves.
+    """
+
+    name = "multiprocess"
+    min_cosine = 0.9999
+
+    def __init__(self, model_name: str = MODEL_NAME, processes: Optional[int] = None, min_pool_texts: int = 256):
+        super().__init__(model_name)
+        self.processes = processes or max(1, (os.cpu_count() or 2) // 2)
+        self.min_pool_texts = min_pool_texts
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.processes)
+        return self._pool
+
+    def encode(self, texts, batch_size: int = 64) -> np.ndarray:
+        texts = list(texts)
+        if len(texts) < self.min_pool_texts or self.processes == 1:
+            return super().encode(texts, batch_size=batch_size)
+        chunk_size = max(batch_size, -(-len(texts) // (self.processes * 4)))
+        vectors = self.model.encode_multi_process(
+            texts, self._get_pool(), batch_size=batch_size, chunk_size=chunk_size
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+
+def _quantized_onnx_file() -> str:
+    """
+    The int8 ONNX exports of all-MiniLM-L6-v2 are built per instruction set.
+    x86 uses the AVX2 one, which cannot run on CPUs without AVX2.
+    """
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo", "r", encoding="utf-8", errors="replace") as f:
+            if " avx2" not in f.read():
+                raise RuntimeError("The onnx-int8 encoder needs a CPU with AVX2; use 'onnx' instead.")
+    return "onnx/model_quint8_avx2.onnx"
+
+
+class OnnxEncoder(SentenceTransformerEncoder):
+    """
+    Runs the exported ONNX graph through onnxruntime (needs
+    sentence-transformers[onnx]). With quantized=True the int8 dynamically
+    quantized export is used, which trades a little accuracy for speed; on
+    x86 that export requires AVX2.
+    """
+
+    name = "onnx"
+    min_cosine = 0.999
+
+    def __init__(self, model_name: str = MODEL_NAME, quantized: bool = False):
+        model_kwargs = {"provider": "CPUExecutionProvider"}
+        if quantized:
+            model_kwargs["file_name"] = _quantized_onnx_file()
+            self.name = "onnx-int8"
+            self.min_cosine = 0.98
+        super().__init__(model_name, backend="onnx", model_kwargs=model_kwargs)
+
+
+class QuantizedEncoder(SentenceTransformerEncoder):
+    """PyTorch model with its Linear layers dynamically quantized to int8."""
+
+    name = "quantized"
+    min_cosine = 0.98
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        super().__init__(model_name)
+        import torch
+
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+ENCODERS = {
+    "default": SentenceTransformerEncoder,
+    "multiprocess": MultiProcessEncoder,
+    "onnx": OnnxEncoder,
+    "onnx-int8": lambda: OnnxEncoder(quantized=True),
+    "quantized": QuantizedEncoder,
+}
+
+
+def build_encoder(kind: str = "default") -> Encoder:
+    if kind not in ENCODERS:
+        raise ValueError(f"Unknown encoder '{kind}'. Choose one of: {', '.join(ENCODERS)}")
+    return ENCODERS[kind]()
@@ -0,0 +1,147 @@
+# agents/issues.py
+import os
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+FIELDS = ("file", "line", "column", "severity", "id", "issue")
+
+
+def _intern(value) -> str:
+    # File paths, rule ids and severities repeat across thousands of
+    # diagnostics; interning keeps one copy of each string.
+    return sys.intern(value) if isinstance(value, str) else sys.intern(str(value or ""))
+
+
+@dataclass(slots=True)
+class Issue:
+    """A single Roslynator diagnostic, passed between all agents."""
+
+    file: str
+    line: int = -1
+    column: int = -1
+    severity: str = ""
+    id: str = ""
+    issue: str = ""
+    distance: Optional[float] = None  # set on semantic search results only
+
+    def __post_init__(self):
+        self.file = _intern(self.file)
+        self.severity = _intern(self.severity)
+        self.id = _intern(self.id)
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Issue":
+        """Build from a parser dict or a stored metadata dict."""
+        return cls(
+            file=d.get("file", ""),
+            line=d.get("line", -1),
+            column=d.get("column", -1),
+            severity=d.get("severity", ""),
+            id=d.get("id") or d.get("ruleId") or "",
+            issue=d.get("issue") or d.get("message", ""),
+            distance=d.get("distance"),
+        )
+
+    @classmethod
+    def summary(cls, text: str) -> "Issue":
+        """Pseudo-issue carrying an aggregate answer, e.g. a count."""
+        return cls(file="(summary)", issue=text)
+
+    @property
+    def is_summary(self) -> bool:
+        return self.file == "(summary)"
+
+    def to_dict(self) -> Dict:
+        d = {name: getattr(self, name) for name in FIELDS}
+        if self.distance is not None:
+            d["distance"] = self.distance
+        return d
+
+
+class IssueBatch:
+    """
+    Column-oriented container for many issues: one list per field instead of
+    one object per issue. Used for bulk work (embedding, listing, counting);
+    iterate it to get Issue records.
+    """
+
+    __slots__ = ("files", "lines", "columns", "severities", "ids", "messages")
+
+    def __init__(self):
+        self.files: List[str] = []
+        self.lines: List[int] = []
+        self.columns: List[int] = []
+        self.severities: List[str] = []
+        self.ids: List[str] = []
+        self.messages: List[str] = []
+
+    @classmethod
+    def from_issues(cls, issues: Iterable) -> "IssueBatch":
+        """Accepts Issue records or plain dicts."""
+        batch = cls()
+        for issue in issues:
+            batch.append(issue if isinstance(issue, Issue) else Issue.from_dict(issue))
+        return batch
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List]) -> "IssueBatch":
+        batch = cls()
+        n = len(columns.get("file", []))
+        batch.files = [_intern(v) for v in columns.get("file", [])]
+        batch.lines = [int(v) for v in columns.get("line", [-1] * n)]
+        batch.columns = [int(v) for v in columns.get("column", [-1] * n)]
+        batch.severities = [_intern(v) for v in columns.get("severity", [""] * n)]
+        batch.ids = [_intern(v) for v in columns.get("id", [""] * n)]
+        batch.messages = list(columns.get("issue", [""] * n))
+        return batch
+
+    def append(self, issue: Issue) -> None:
+        self.files.append(issue.file)
+        self.lines.append(issue.line)
+        self.columns.append(issue.column)
+        self.severities.append(issue.severity)
+        self.ids.append(issue.id)
+        self.messages.append(issue.issue)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __getitem__(self, i: int) -> Issue:
+        return Issue(
+            self.files[i], self.lines[i], self.columns[i],
+            self.severities[i], self.ids[i], self.messages[i],
+        )
+
+    def __iter__(self) -> Iterator[Issue]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def with_files(self, fn: Callable[[str], str]) -> "IssueBatch":
+        """A copy with every file path passed through fn, called once per distinct path."""
+        cache = {}
+        for f in self.files:
+            if f not in cache:
+                cache[f] = _intern(fn(f))
+        batch = IssueBatch()
+        batch.files = [cache[f] for f in self.files]
+        batch.lines = list(self.lines)
+        batch.columns = list(self.columns)
+        batch.severities = list(self.severities)
+        batch.ids = list(self.ids)
+        batch.messages = list(self.messages)
+        return batch
+
+    def resolve_paths(self, repo_root: Optional[str] = None) -> "IssueBatch":
+        """A copy with absolute file paths; relative ones are taken from repo_root."""
+        def resolve(file_path: str) -> str:
+            if not file_path:
+                return ""
+            if repo_root and not os.path.isabs(file_path):
+                return os.path.abspath(os.path.join(repo_root, file_path))
+            return os.path.abspath(file_path)
+
+        return self.with_files(resolve)
+
+    def select(self, rows: Iterable[int]) -> List[Issue]:
+        return [self[i] for i in rows]
@@ -1,89 +1,98 @@
-from chromadb import Client
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
+import os
 from collections import Counter
+from agents.encoders import SentenceTransformerEncoder
+from agents.issues import Issue, IssueBatch
+from agents.vector_store import ChromaVectorStore
 
 class QueryAgent:
-    def __init__(self, collection_name: str = "roslynator_issues", chroma_client=None):
+    def __init__(self, collection_name: str = "roslynator_issues", chroma_client=None, vector_store=None, encoder=None,
+                 snapshot_store=None):
         self.collection_name = collection_name
-        if chroma_client is None:
-            raise ValueError("chroma_client must be provided")
-        self.chroma_client = chroma_client
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        if vector_store is None:
+            if chroma_client is None:
+                raise ValueError("chroma_client or vector_store must be provided")
+            vector_store = ChromaVectorStore(chroma_client, collection_name)
+        self.vector_store = vector_store
+        self._encoder = encoder
+        self.snapshot_store = snapshot_store
+
+    @property
+    def encoder(self):
+        # Listing and counting issues never needs the model, so load it on first search.
+        if self._encoder is None:
+            self._encoder = SentenceTransformerEncoder()
+        return self._encoder
+
+    def _get_issue_batch(self) -> IssueBatch:
+        if self.vector_store.count() == 0:
+            return IssueBatch()
+        return IssueBatch.from_columns(self.vector_store.get_columns())
 
     def _get_all_issues(self):
-        collection = self.chroma_client.get_collection(self.collection_name)
-        if collection.count() == 0:
-            return []
-        results = collection.get(include=["metadatas"], limit=collection.count())
-        issues = []
-        for m in results.get("metadatas", []):
-            if isinstance(m, dict):
-                issues.append({
-                    "file": m.get("file", "unknown"),
-                    "line": m.get("line", -1),
-                    "column": m.get("column", -1),
-                    "severity": m.get("severity", "unknown"),
-                    "issue": m.get("issue") or m.get("message", "unknown"),
-                    "id": m.get("id", "unknown"),
-                })
-        return issues
+        return list(self._get_issue_batch())
+
+    def _latest_run(self):
+        """(label, path) of the newest snapshot, or None when there is none to read."""
+        run = self.snapshot_store.latest() if self.snapshot_store is not None else None
+        if run is None:
+            return None
+        repo = os.path.basename(os.path.dirname(run))
+        return f"latest run {os.path.splitext(os.path.basename(run))[0]} of {repo}", run
 
     def search_issues(self, query_text: str, top_k: int = 5):
         query_text_l = (query_text or "").lower().strip()
-        collection = self.chroma_client.get_collection(self.collection_name)
-        if collection.count() == 0:
+        if self.vector_store.count() == 0:
             print("[QueryAgent] No issues found in the database.")
             return []
         
-        # Load all issues from collection
-        issues = self._get_all_issues()
-        total = len(issues)
+        # --- Counting queries: no full scan of the store ---
+        wants_total = "how many" in query_text_l or "count" in query_text_l or query_text_l == "total"
+        wants_categories = "categories" in query_text_l or "types" in query_text_l
+        latest = self._latest_run() if wants_total or wants_categories else None
+        if wants_total:
+            # the store holds every run of every repo, deduplicated; the snapshot only the latest run
+            answer = f"Total issues: {self.vector_store.count()} indexed"
+            if latest:
+                answer += f" ({self.snapshot_store.count(latest[1])} in {latest[0]})"
+            return [Issue.summary(answer)]
+        if wants_categories and latest:
+            ids = self.snapshot_store.load(latest[1], columns=["id"])["id"].astype(str)
+            cats = {rule: int(n) for rule, n in ids[ids != ""].value_counts().items()}
+            return [Issue.summary(f"Issue categories in {latest[0]}: {cats}")]
+
+        # Load all issues from collection, column-wise
+        batch = self._get_issue_batch()
 
         # --- Special queries ---
         if "which agent" in query_text_l or query_text_l == "agent" or " agent " in f" {query_text_l} ":
-            unique_files = sorted(set(i["file"] for i in issues if i["file"]))
-            return [{"file": "(summary)", "issue": f"Issues found in files: {unique_files}"}]
+            unique_files = sorted(set(f for f in batch.files if f))
+            return [Issue.summary(f"Issues found in files: {unique_files}")]
 
         if query_text_l in ("all", "show all issues", "list issues"):
-            return issues
-
-        if "how many" in query_text_l or "count" in query_text_l or query_text_l == "total":
-            return [{"file": "(summary)", "issue": f"Total issues: {total}"}]
+            return list(batch)
 
-        if "categories" in query_text_l or "types" in query_text_l:
-            cats = Counter(i["id"] for i in issues if i["id"])
-            return [{"file": "(summary)", "issue": f"Issue categories: {dict(cats)}"}]
+        if wants_categories:
+            cats = Counter(rule for rule in batch.ids if rule)
+            return [Issue.summary(f"Issue categories: {dict(cats)}")]
 
         if "high severity" in query_text_l or "errors" in query_text_l or "error" in query_text_l:
-            return [i for i in issues if str(i["severity"]).lower() in ("error", "high")]
+            return batch.select(
+                i for i, sev in enumerate(batch.severities) if sev.lower() in ("error", "high")
+            )
 
         # --- Default semantic search ---
-        query_embedding = self.model.encode([query_text])[0].tolist()
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k,
-            include=["metadatas", "distances"],
-        )
-    
-        metadatas = results.get("metadatas", [[]])[0]
-        distances = results.get("distances", [[]])[0]
+        query_embedding = self.encoder.encode([query_text])[0]
+        metadatas, distances = self.vector_store.query(query_embedding, top_k=top_k)
 
         clean_results = []
         for i, m in enumerate(metadatas):
             if not isinstance(m, dict):
                 continue
-            clean_results.append({
-                "file": m.get("file", "unknown"),
-                "line": m.get("line", -1),
-                "column": m.get("column", -1),
-                "severity": m.get("severity", "unknown"),
-                "issue": m.get("issue") or m.get("message", "unknown"),
-                "id": m.get("id", "unknown"),
-                "distance": distances[i] if i < len(distances) else None,
-            })
-
-        clean_results.sort(key=lambda x: (x.get("distance") is None, x.get("distance", 0)))
+            result = Issue.from_dict(m)
+            result.distance = distances[i] if i < len(distances) else None
+            clean_results.append(result)
+
+        clean_results.sort(key=lambda x: (x.distance is None, x.distance or 0))
         return clean_results
 
     def query_issues(self):
@@ -97,22 +106,18 @@ class QueryAgent:
             return
 
         # Pretty print
-        if results[0].get("file") == "(summary)":
+        if results[0].is_summary:
             for r in results:
-                print(r["issue"])
+                print(r.issue)
         else:
             print(f"\nTop {len(results)} issues:")
             for i, res in enumerate(results, 1):
                 print(
-                    f"{i}. File: {res.get('file','unknown')}\n"
-                    f"   Line: {res.get('line','unknown')}, Column: {res.get('column','unknown')}\n"
-                    f"   Severity: {res.get('severity','unknown')}\n"
-                    f"   Issue: {res.get('issue','unknown')}\n"
+                    f"{i}. File: {res.file or 'unknown'}\n"
+                    f"   Line: {res.line}, Column: {res.column}\n"
+                    f"   Severity: {res.severity or 'unknown'}\n"
+                    f"   Issue: {res.issue or 'unknown'}\n"
                 )
 
     def is_ready(self) -> bool:
-        try:
-            col = self.chroma_client.get_collection(self.collection_name)
-            return col.count() > 0
-        except Exception:
-            return False
+        return self.vector_store.count() > 0
@@ -5,10 +5,15 @@ from agents.approval_agent import ApprovalAgent
 from agents.query_agent import QueryAgent
 
 class RefactorAgent:
-    def __init__(self, chroma_client, repo_root: str, collection_name: str = "roslynator_issues"):
+    def __init__(self, chroma_client=None, repo_root: str = None, collection_name: str = "roslynator_issues", vector_store=None, encoder=None):
+        if not repo_root:
+            raise ValueError("repo_root must be provided")
         self.client = OpenAI()
         self.approval_agent = ApprovalAgent()
-        self.query_agent = QueryAgent(collection_name=collection_name, chroma_client=chroma_client)
+        self.query_agent = QueryAgent(
+            collection_name=collection_name, chroma_client=chroma_client, vector_store=vector_store,
+            encoder=encoder,
+        )
         self.repo_root = os.path.abspath(repo_root)
         self._repo_index = None  # built lazily for robust path matching
 
@@ -97,17 +102,17 @@ class RefactorAgent:
         return True
 
     def approval_and_refactor_loop(self):
-        # Pull all issues from Chroma via QueryAgent (no JSON)
-        issues = self.query_agent._get_all_issues()
+        # Pull all issues from the vector store via QueryAgent (no JSON)
+        issues = self.query_agent._get_issue_batch()
         if not issues:
-            print("No issues found in ChromaDB.")
+            print("No issues found in the vector store.")
             return
 
         for idx, issue in enumerate(issues):
             issue_id = f"issue_{idx}"
-            file_hint = issue.get("file") or ""
+            file_hint = issue.file or ""
             file_path = self._resolve_file(file_hint)
-            issue_description = issue.get("issue") or ""
+            issue_description = issue.issue or ""
 
             if not file_path or not os.path.exists(file_path):
                 print(f"[SKIPPED] Invalid file path for {issue_id}: {file_hint}")
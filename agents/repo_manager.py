@@ -1,8 +1,6 @@
 import os
 import subprocess
 import shutil
-from agents.roslynator_agent import RoslynatorAgent
-from agents.embedding_agent import EmbeddingAgent
 
 class RepoManager:
     def __init__(self, base_path="workspace"):
@@ -66,6 +64,9 @@ class RepoManager:
         """
         Full pipeline: clone repo, analyze with Roslynator, store embeddings.
         """
+        from agents.roslynator_agent import RoslynatorAgent
+        from agents.embedding_agent import EmbeddingAgent
+
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
         DB_DIR = os.path.join(BASE_DIR, "chroma_db")
 
@@ -1,24 +1,236 @@
 # agents/reporting_agent.py
+import json
+import os
+from pathlib import PurePath, Path
+from urllib.parse import quote
+
+import pandas as pd
 from agents.query_agent import QueryAgent
 
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note", "hidden": "none"}
+EXPORT_FORMATS = ("jsonl", "csv", "sarif")
+# SARIF uriBaseId for paths relative to the analyzed checkout
+SARIF_SRCROOT = "SRCROOT"
+
+
 class ReportingAgent:
-    def __init__(self, chroma_client, collection_name="roslynator_issues"):
-        if chroma_client is None:
-            raise ValueError("chroma_client must be provided")
-        # create QueryAgent with the shared chroma client
-        self.query_agent = QueryAgent(collection_name=collection_name, chroma_client=chroma_client)
+    def __init__(self, chroma_client=None, collection_name="roslynator_issues", vector_store=None, encoder=None,
+                 snapshot_store=None):
+        if chroma_client is None and vector_store is None and snapshot_store is None:
+            raise ValueError("chroma_client, vector_store or snapshot_store must be provided")
+        # create QueryAgent with the shared chroma client or vector store;
+        # snapshot-only reports never open the vector store
+        self.query_agent = None
+        if chroma_client is not None or vector_store is not None:
+            self.query_agent = QueryAgent(
+                collection_name=collection_name, chroma_client=chroma_client, vector_store=vector_store,
+                encoder=encoder,
+            )
+        self.snapshot_store = snapshot_store
 
     def show_all(self):
-        issues = self.query_agent._get_all_issues()
+        if self.query_agent is None:
+            raise ValueError("chroma_client or vector_store must be provided to list stored issues")
+        issues = self.query_agent._get_issue_batch()
         if not issues:
-            print("[ReportingAgent] No issues found in ChromaDB.")
+            print("[ReportingAgent] No issues found in the vector store.")
             return
 
         print(f"\n[ReportingAgent] Total issues: {len(issues)}\n")
         for i, issue in enumerate(issues, 1):
             print(
-                f"{i}. File: {issue.get('file','unknown')}\n"
-                f"   Line: {issue.get('line','unknown')}, Column: {issue.get('column','unknown')}\n"
-                f"   Severity: {issue.get('severity','unknown')}\n"
-                f"   Issue: {issue.get('issue','unknown')}\n"
+                f"{i}. File: {issue.file or 'unknown'}\n"
+                f"   Line: {issue.line}, Column: {issue.column}\n"
+                f"   Severity: {issue.severity or 'unknown'}\n"
+                f"   Issue: {issue.issue or 'unknown'}\n"
             )
+
+    # ---------- snapshot reports (no vector store access) ----------
+    def _run(self, run=None):
+        if self.snapshot_store is None:
+            raise ValueError("snapshot_store must be provided for snapshot reports")
+        if not run:
+            run = self.snapshot_store.latest()
+            if run is None:
+                raise FileNotFoundError("No analysis snapshots found. Please run clone and analysis first.")
+            return run
+        # only runs this store wrote, never an arbitrary Parquet file
+        resolved = self.snapshot_store.resolve(run)
+        if resolved is None:
+            raise FileNotFoundError(f"Unknown snapshot run: {run}")
+        return resolved
+
+    def export(self, out_path: str, fmt: str = None, run: str = None, chunk_rows: int = 100000) -> int:
+        """
+        Stream a snapshot to JSONL, CSV or SARIF without loading it whole.
+        The format defaults to the file extension. Returns the number of issues written.
+        """
+        run = self._run(run)
+        fmt = (fmt or os.path.splitext(out_path)[1].lstrip(".")).lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}")
+
+        written = 0
+        repo_root = self.snapshot_store.repo_root(run) if fmt == "sarif" else None
+        with open(out_path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "sarif":
+                rules = sorted(self.snapshot_store.load(run, columns=["id"])["id"].dropna().unique())
+                sarif_run = {"tool": {"driver": {"name": "Roslynator", "rules": [{"id": str(r)} for r in rules]}}}
+                if repo_root:
+                    sarif_run["originalUriBaseIds"] = {SARIF_SRCROOT: {"uri": Path(repo_root).as_uri() + "/"}}
+                sarif_run["results"] = []
+                header = {
+                    "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+                    "version": "2.1.0",
+                    "runs": [sarif_run],
+                }
+                # split the document around the empty results array and stream entries into it
+                head, tail = json.dumps(header).rsplit('"results": []', 1)
+                f.write(head + '"results": [\n')
+
+            for df in self.snapshot_store.iter_chunks(run, chunk_rows=chunk_rows):
+                if fmt == "csv":
+                    df.to_csv(f, header=(written == 0), index=False)
+                elif fmt == "jsonl":
+                    text = df.to_json(orient="records", lines=True, force_ascii=False)
+                    f.write(text if text.endswith("\n") else text + "\n")
+                else:
+                    lines = self._sarif_results(df, repo_root)
+                    if len(lines):
+                        f.write((",\n" if written else "") + ",\n".join(lines))
+                written += len(df)
+
+            if fmt == "sarif":
+                f.write("\n]" + tail)
+
+        print(f"[ReportingAgent] Exported {written} issues to {out_path} ({fmt})")
+        return written
+
+    @staticmethod
+    def _render_distinct(series, render):
+        # render each distinct value once and broadcast through category codes
+        cat = series.astype(str).astype("category")
+        rendered = [render(v) for v in cat.cat.categories]
+        return pd.Series(pd.Index(rendered, dtype=object).take(cat.cat.codes.to_numpy()), index=series.index)
+
+    @classmethod
+    def _json_strings(cls, series):
+        return cls._render_distinct(series, lambda v: json.dumps(v, ensure_ascii=False))
+
+    @staticmethod
+    def _artifact_location(path: str, repo_root: str = None) -> dict:
+        """
+        SARIF artifactLocation for one file: relative to SRCROOT when it lies
+        in the analyzed checkout, otherwise a file:// URI.
+        """
+        if repo_root and os.path.isabs(path):
+            rel = os.path.relpath(path, repo_root)
+            if rel != os.pardir and not rel.startswith(os.pardir + os.sep):
+                path = rel
+            else:
+                return {"uri": Path(path).as_uri()}
+        elif os.path.isabs(path):
+            return {"uri": Path(path).as_uri()}
+        location = {"uri": quote(PurePath(path).as_posix())}
+        if repo_root:
+            location["uriBaseId"] = SARIF_SRCROOT
+        return location
+
+    def _sarif_results(self, df, repo_root: str = None):
+        """One serialized SARIF result per row, built with column-wise string ops."""
+        levels = df["severity"].astype(str).str.lower().map(SARIF_LEVELS).fillna("note")
+        locations = self._render_distinct(df["file"], lambda f: json.dumps(self._artifact_location(f, repo_root)))
+        # SARIF line/column numbers start at 1; unknown positions (-1) get no region
+        has_line = df["line"] >= 1
+        start_column = (', "startColumn": ' + df["column"].astype(str)).where(has_line & (df["column"] >= 1), "")
+        regions = (', "region": {"startLine": ' + df["line"].astype(str) + start_column + "}").where(has_line, "")
+        return (
+            '{"ruleId": ' + self._json_strings(df["id"])
+            + ', "level": "' + levels
+            + '", "message": {"text": ' + self._json_strings(df["issue"])
+            + '}, "locations": [{"physicalLocation": {"artifactLocation": ' + locations
+            + regions + "}}]}"
+        ).tolist()
+
+    def aggregates(self, run: str = None, top: int = None):
+        """Issue counts per rule, severity, file and directory for one snapshot."""
+        run = self._run(run)
+        df = self.snapshot_store.load(run, columns=["file", "severity", "id"])
+        files = df["file"].astype("category")
+        # dirname is computed once per distinct file, then broadcast through the categorical codes
+        dir_names = [os.path.dirname(str(f)) or "." for f in files.cat.categories]
+        directories = pd.Series(pd.Index(dir_names, dtype=object).take(files.cat.codes.to_numpy()))
+
+        def counts(series, name):
+            out = series.value_counts(sort=True).rename("count").rename_axis(name).reset_index()
+            out = out[out["count"] > 0]
+            return out.head(top) if top else out
+
+        return {
+            "run": run,
+            "total": len(df),
+            "by_rule": counts(df["id"], "rule"),
+            "by_severity": counts(df["severity"], "severity"),
+            "by_file": counts(files, "file"),
+            "by_directory": counts(directories, "directory"),
+        }
+
+    def diff(self, run: str = None, base: str = None):
+        """
+        Compare a snapshot with an earlier one of the same repo (the previous
+        run by default). Issues are matched on rule, file and line.
+        """
+        run = self._run(run)
+        base = self._run(base) if base else self.snapshot_store.previous(run)
+        if base is None:
+            raise FileNotFoundError(f"No earlier snapshot to compare {run} with.")
+
+        key = ["id", "file", "line"]
+        new = self.snapshot_store.load(run)
+        old = self.snapshot_store.load(base)
+        for df in (new, old):
+            for col in ("id", "file"):
+                df[col] = df[col].astype(str)
+
+        def only_in(left, right):
+            merged = left.merge(right[key].drop_duplicates(), on=key, how="left", indicator=True)
+            return merged[merged["_merge"] == "left_only"].drop(columns="_merge")
+
+        added = only_in(new, old)
+        resolved = only_in(old, new)
+
+        by_rule = (
+            new["id"].value_counts().rename("current").to_frame()
+            .join(old["id"].value_counts().rename("previous"), how="outer")
+            .fillna(0).astype(int)
+        )
+        by_rule["delta"] = by_rule["current"] - by_rule["previous"]
+        by_rule = by_rule.rename_axis("rule").reset_index().sort_values("delta", key=abs, ascending=False)
+
+        return {
+            "run": run,
+            "base": base,
+            "current_total": len(new),
+            "previous_total": len(old),
+            "added": added.reset_index(drop=True),
+            "resolved": resolved.reset_index(drop=True),
+            "by_rule": by_rule.reset_index(drop=True),
+        }
+
+    def show_summary(self, run: str = None, top: int = 10):
+        agg = self.aggregates(run, top=top)
+        print(f"\n[ReportingAgent] Snapshot {agg['run']}: {agg['total']} issues")
+        for title, key in (("Severity", "by_severity"), ("Rules", "by_rule"),
+                           ("Directories", "by_directory"), ("Files", "by_file")):
+            print(f"\n{title} (top {top}):")
+            print(agg[key].to_string(index=False))
+
+    def show_diff(self, run: str = None, base: str = None, top: int = 10):
+        d = self.diff(run, base)
+        print(f"\n[ReportingAgent] {d['base']} -> {d['run']}")
+        print(f"Issues: {d['previous_total']} -> {d['current_total']} "
+              f"(+{len(d['added'])} new, -{len(d['resolved'])} resolved)")
+        changed = d["by_rule"][d["by_rule"]["delta"] != 0].head(top)
+        if len(changed):
+            print(f"\nLargest changes by rule (top {top}):")
+            print(changed.to_string(index=False))
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 import re
 import shutil
+from agents.issues import Issue
 
 class RoslynatorAgent:
     def __init__(self, repo_path: str, output_dir: str):
@@ -73,7 +74,7 @@ class RoslynatorAgent:
 
         # Always write a JSON report (possibly empty) so callers can inspect
         with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(issues, f, indent=2)
+            json.dump([issue.to_dict() for issue in issues], f, indent=2)
 
         print(f"[RoslynatorAgent] Analysis text saved to {text_path}")
         print(f"[RoslynatorAgent] Analysis stderr saved to {stderr_path}")
@@ -83,8 +84,8 @@ class RoslynatorAgent:
 
     def parse_text_report_to_json(self, report_path: Path):
         """
-        Robust parser for Roslynator textual output. Returns list of issues.
-        Each issue: { file, line, column, severity, id, issue }
+        Robust parser for Roslynator textual output. Returns a list of Issue records
+        (file, line, column, severity, id, issue).
         - Handles single-line diagnostics and simple wrapped continuation lines.
         - Skips unrelated lines quietly.
         """
@@ -98,17 +99,17 @@ class RoslynatorAgent:
                 m = pattern.match(line.strip())
                 if m:
                     file_path, line_num, col_num, severity, diag_id, message = m.groups()
-                    issues.append({
-                        "file": file_path,
-                        "line": int(line_num),
-                        "column": int(col_num),
-                        "severity": severity,
-                        "id": diag_id,
-                        "issue": message.strip()
-                    })
+                    issues.append(Issue(
+                        file=file_path,
+                        line=int(line_num),
+                        column=int(col_num),
+                        severity=severity,
+                        id=diag_id,
+                        issue=message.strip()
+                    ))
                 else:
                     if (line.startswith(" ") or line.startswith("\t")) and issues:
-                        issues[-1]["issue"] += " " + line.strip()
+                        issues[-1].issue += " " + line.strip()
                     else:
                         continue
         return issues
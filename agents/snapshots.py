@@ -0,0 +1,128 @@
+# agents/snapshots.py
+import os
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+from agents.issues import IssueBatch
+
+# Low-cardinality columns are stored dictionary-encoded (pandas Categorical).
+CATEGORY_COLUMNS = ("file", "severity", "id")
+# Parquet schema metadata key holding the analyzed checkout's absolute path
+REPO_ROOT_KEY = b"repo_root"
+
+
+class SnapshotStore:
+    """
+    Columnar (Parquet) snapshot of the issues found by each analysis run,
+    written to <root_dir>/<repo_name>/<run_id>.parquet. Reports and
+    aggregates read these files instead of the vector store.
+    """
+
+    def __init__(self, root_dir: str = "snapshots"):
+        self.root_dir = root_dir
+
+    def write(self, batch: IssueBatch, repo_name: str, repo_root: Optional[str] = None) -> str:
+        """
+        Write one run. repo_root, when given, is kept in the file metadata so
+        exports can emit paths relative to the analyzed checkout.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        repo_dir = os.path.join(self.root_dir, repo_name)
+        os.makedirs(repo_dir, exist_ok=True)
+        run_id = time.strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(repo_dir, f"{run_id}.parquet")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(repo_dir, f"{run_id}-{suffix}.parquet")
+            suffix += 1
+
+        df = pd.DataFrame({
+            "file": pd.Categorical(batch.files),
+            "line": pd.array(batch.lines, dtype="int32"),
+            "column": pd.array(batch.columns, dtype="int32"),
+            "severity": pd.Categorical(batch.severities),
+            "id": pd.Categorical(batch.ids),
+            "issue": batch.messages,
+        })
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if repo_root:
+            metadata = dict(table.schema.metadata or {})
+            metadata[REPO_ROOT_KEY] = os.path.abspath(repo_root).encode("utf-8")
+            table = table.replace_schema_metadata(metadata)
+        tmp_path = path + ".tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)  # readers never see a half-written run
+        print(f"[SnapshotStore] Snapshot saved to {path} ({len(df)} issues)")
+        return path
+
+    def runs(self, repo_name: Optional[str] = None) -> List[str]:
+        """Snapshot paths, oldest first; across all repos when repo_name is None."""
+        if not os.path.isdir(self.root_dir):
+            return []
+        repos = [repo_name] if repo_name else sorted(os.listdir(self.root_dir))
+        paths = []
+        for repo in repos:
+            repo_dir = os.path.join(self.root_dir, repo)
+            if not os.path.isdir(repo_dir):
+                continue
+            paths += [os.path.join(repo_dir, fn) for fn in os.listdir(repo_dir) if fn.endswith(".parquet")]
+        return sorted(paths, key=self._run_key)
+
+    @staticmethod
+    def _run_key(path: str):
+        # "<run_id>-<n>.parquet" is the n-th collision on <run_id> and sorts after "<run_id>.parquet"
+        run_id, _, suffix = os.path.basename(path)[:-len(".parquet")].partition("-")
+        return run_id, int(suffix) if suffix.isdigit() else 0, path
+
+    def latest(self, repo_name: Optional[str] = None) -> Optional[str]:
+        runs = self.runs(repo_name)
+        return runs[-1] if runs else None
+
+    def resolve(self, run: str) -> Optional[str]:
+        """The runs() entry that `run` names, however it is spelled, or None if it is not one."""
+        real = os.path.realpath(run)
+        repo = os.path.basename(os.path.dirname(real))
+        for candidate in self.runs(repo) if repo else []:
+            if os.path.realpath(candidate) == real:
+                return candidate
+        return None
+
+    def previous(self, run: str) -> Optional[str]:
+        """The run before `run` for the same repo, if any."""
+        run = self.resolve(run)
+        if run is None:
+            return None
+        runs = self.runs(os.path.basename(os.path.dirname(run)))
+        idx = runs.index(run)
+        return runs[idx - 1] if idx > 0 else None
+
+    @staticmethod
+    def load(run: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_parquet(run, columns=columns)
+
+    @staticmethod
+    def count(run: str) -> int:
+        """Number of issues in a run, from the Parquet footer."""
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(run).metadata.num_rows
+
+    @staticmethod
+    def repo_root(run: str) -> Optional[str]:
+        """The checkout a run was analyzed from, or None for runs written without one."""
+        import pyarrow.parquet as pq
+
+        root = (pq.read_schema(run).metadata or {}).get(REPO_ROOT_KEY)
+        return root.decode("utf-8") if root else None
+
+    @staticmethod
+    def iter_chunks(run: str, chunk_rows: int = 100000, columns: Optional[List[str]] = None):
+        """Yield the snapshot as DataFrames of at most chunk_rows rows."""
+        import pyarrow.parquet as pq
+
+        for record_batch in pq.ParquetFile(run).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield record_batch.to_pandas()
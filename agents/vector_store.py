@@ -0,0 +1,369 @@
+# agents/vector_store.py
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Metadata schema shared by every backend. "key" is the unique id of a row,
+# "document" the text that was embedded.
+STRING_COLUMNS = ("key", "file", "severity", "id", "issue", "document")
+INT_COLUMNS = ("line", "column")
+
+
+class VectorStore:
+    """
+    Minimal interface the agents use to store and search issue embeddings.
+    Distances returned by query() are squared L2, matching Chroma's default.
+    """
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def existing_ids(self) -> Set[str]:
+        raise NotImplementedError
+
+    def add(self, ids: List[str], documents: List[str], metadatas: List[Dict], embeddings) -> None:
+        raise NotImplementedError
+
+    def get_metadatas(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def get_columns(self) -> Dict[str, List]:
+        """All stored metadata as one list per column (see STRING_COLUMNS/INT_COLUMNS)."""
+        metadatas = self.get_metadatas()
+        names = [c for c in STRING_COLUMNS + INT_COLUMNS if c not in ("key", "document")]
+        return {name: [m.get(name, -1 if name in INT_COLUMNS else "") for m in metadatas] for name in names}
+
+    def query(self, embedding, top_k: int = 5) -> Tuple[List[Dict], List[float]]:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class ChromaVectorStore(VectorStore):
+    def __init__(self, chroma_client, collection_name: str = "roslynator_issues"):
+        if chroma_client is None:
+            raise ValueError("chroma_client must be provided")
+        self.chroma_client = chroma_client
+        self.collection_name = collection_name
+
+    def _collection(self, create: bool = False):
+        if create:
+            return self.chroma_client.get_or_create_collection(self.collection_name)
+        return self.chroma_client.get_collection(self.collection_name)
+
+    def count(self) -> int:
+        try:
+            return self._collection().count()
+        except Exception:
+            return 0
+
+    def existing_ids(self) -> Set[str]:
+        existing = set()
+        if self.count() == 0:
+            return existing
+        got = self._collection().get(include=[])
+        for item in got.get("ids", []):
+            if isinstance(item, list):
+                existing.update(item)
+            else:
+                existing.add(item)
+        return existing
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        if not ids:
+            return
+        embeddings = [e.tolist() if hasattr(e, "tolist") else list(e) for e in embeddings]
+        self._collection(create=True).add(
+            documents=list(documents),
+            metadatas=list(metadatas),
+            ids=list(ids),
+            embeddings=embeddings,
+        )
+
+    def get_metadatas(self) -> List[Dict]:
+        total = self.count()
+        if total == 0:
+            return []
+        results = self._collection().get(include=["metadatas"], limit=total)
+        return [m for m in results.get("metadatas", []) if isinstance(m, dict)]
+
+    def query(self, embedding, top_k: int = 5):
+        if hasattr(embedding, "tolist"):
+            embedding = embedding.tolist()
+        results = self._collection().query(
+            query_embeddings=[embedding],
+            n_results=top_k,
+            include=["metadatas", "distances"],
+        )
+        metadatas = results.get("metadatas", [[]])[0]
+        distances = results.get("distances", [[]])[0]
+        return metadatas, distances
+
+    def reset(self) -> None:
+        try:
+            self.chroma_client.delete_collection(self.collection_name)
+        except Exception:
+            pass
+
+
+def _truncate_rows(path: str, n: int, row_bytes: int) -> None:
+    if os.path.exists(path) and os.path.getsize(path) > n * row_bytes:
+        os.truncate(path, n * row_bytes)
+
+
+class _StringColumn:
+    """Append-only UTF-8 column: a byte blob plus an int64 array of end offsets."""
+
+    def __init__(self, base_path: str):
+        self.data_path = base_path + ".data"
+        self.offsets_path = base_path + ".offsets"
+
+    def __len__(self) -> int:
+        if not os.path.exists(self.offsets_path):
+            return 0
+        return os.path.getsize(self.offsets_path) // 8
+
+    def append(self, values: Iterable[str]) -> None:
+        encoded = [str(v).encode("utf-8") for v in values]
+        start = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        ends = start + np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        with open(self.data_path, "ab") as f:
+            f.write(b"".join(encoded))
+        with open(self.offsets_path, "ab") as f:
+            f.write(ends.astype(np.int64).tobytes())
+
+    def truncate(self, n: int) -> None:
+        """Drop rows beyond the first n (left behind by an interrupted append)."""
+        if len(self) > n:
+            end = int(np.fromfile(self.offsets_path, dtype=np.int64, count=n)[-1]) if n else 0
+            os.truncate(self.offsets_path, n * 8)
+            os.truncate(self.data_path, end)
+
+    def read(self, limit: Optional[int] = None) -> List[str]:
+        n = len(self) if limit is None else min(limit, len(self))
+        if n == 0:
+            return []
+        ends = np.fromfile(self.offsets_path, dtype=np.int64, count=n)
+        with open(self.data_path, "rb") as f:
+            blob = f.read(int(ends[-1]))
+        starts = [0] + ends[:-1].tolist()
+        ends = ends.tolist()
+        if blob.isascii():
+            # byte offsets equal character offsets, so decode the blob once
+            text = blob.decode("ascii")
+            return [text[s:e] for s, e in zip(starts, ends)]
+        return [blob[s:e].decode("utf-8") for s, e in zip(starts, ends)]
+
+    def take(self, rows: List[int], limit: int) -> List[str]:
+        """Values of a few rows, reading only their byte ranges."""
+        if not rows:
+            return []
+        ends = np.memmap(self.offsets_path, dtype=np.int64, mode="r", shape=(limit,))
+        values = []
+        with open(self.data_path, "rb") as f:
+            for r in rows:
+                start = int(ends[r - 1]) if r else 0
+                f.seek(start)
+                values.append(f.read(int(ends[r]) - start).decode("utf-8"))
+        return values
+
+
+class _IntColumn:
+    def __init__(self, base_path: str):
+        self.path = base_path + ".i32"
+
+    def append(self, values: Iterable[int]) -> None:
+        with open(self.path, "ab") as f:
+            f.write(np.asarray(list(values), dtype=np.int32).tobytes())
+
+    def truncate(self, n: int) -> None:
+        _truncate_rows(self.path, n, 4)
+
+    def read(self, limit: int) -> np.ndarray:
+        if limit == 0 or not os.path.exists(self.path):
+            return np.empty(0, dtype=np.int32)
+        return np.memmap(self.path, dtype=np.int32, mode="r", shape=(limit,))
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Memory-mapped vector index stored as a flat float16 or int8-quantized
+    matrix, with a columnar metadata sidecar next to it.
+
+    Layout of <root_dir>/<collection_name>/:
+      store.json         dim and dtype
+      vectors.bin        row-major matrix, appended on add()
+      scales.f32         per-row dequantization scale (int8 only)
+      norms.f32          squared L2 norm of each stored row
+      <column>.*         one file (or data/offsets pair) per metadata column
+    """
+
+    DTYPES = {"float16": np.float16, "int8": np.int8}
+
+    def __init__(
+        self,
+        root_dir: str = "vector_db",
+        collection_name: str = "roslynator_issues",
+        dim: int = 384,
+        dtype: str = "float16",
+        chunk_size: int = 65536,
+    ):
+        if dtype not in self.DTYPES:
+            raise ValueError(f"dtype must be one of {sorted(self.DTYPES)}")
+        self.path = os.path.join(root_dir, collection_name)
+        self.chunk_size = chunk_size
+        self._ids_cache = None
+        self._open(dim, dtype)
+
+    def _open(self, dim: int, dtype: str) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        header_path = os.path.join(self.path, "store.json")
+        if os.path.exists(header_path):
+            with open(header_path, "r", encoding="utf-8") as f:
+                header = json.load(f)
+            dim, dtype = header["dim"], header["dtype"]
+        else:
+            with open(header_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": dim, "dtype": dtype}, f)
+        self.dim = dim
+        self.dtype = dtype
+        self._np_dtype = self.DTYPES[dtype]
+        self._vectors_path = os.path.join(self.path, "vectors.bin")
+        self._scales_path = os.path.join(self.path, "scales.f32")
+        self._norms_path = os.path.join(self.path, "norms.f32")
+        self._strings = {c: _StringColumn(os.path.join(self.path, c)) for c in STRING_COLUMNS}
+        self._ints = {c: _IntColumn(os.path.join(self.path, c)) for c in INT_COLUMNS}
+        self._repair()
+
+    def _repair(self) -> None:
+        # add() writes vectors.bin last, so count() is the number of committed
+        # rows. Cut every other file back to it, otherwise rows left by an
+        # interrupted add() would shift all later metadata against the vectors.
+        n = self.count()
+        row_bytes = self.dim * np.dtype(self._np_dtype).itemsize
+        _truncate_rows(self._vectors_path, n, row_bytes)
+        _truncate_rows(self._norms_path, n, 4)
+        _truncate_rows(self._scales_path, n, 4)
+        for column in list(self._strings.values()) + list(self._ints.values()):
+            column.truncate(n)
+
+    def count(self) -> int:
+        if not os.path.exists(self._vectors_path):
+            return 0
+        row_bytes = self.dim * np.dtype(self._np_dtype).itemsize
+        return os.path.getsize(self._vectors_path) // row_bytes
+
+    def existing_ids(self) -> Set[str]:
+        if self._ids_cache is None:
+            self._ids_cache = set(self._strings["key"].read(limit=self.count()))
+        return set(self._ids_cache)
+
+    def _encode(self, matrix: np.ndarray):
+        if self.dtype == "int8":
+            scales = np.abs(matrix).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            stored = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+            restored = stored.astype(np.float32) * scales[:, None]
+            return stored, scales.astype(np.float32), restored
+        stored = matrix.astype(np.float16)
+        return stored, None, stored.astype(np.float32)
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        if not ids:
+            return
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-d embeddings, got {matrix.shape[1]}-d")
+        stored, scales, restored = self._encode(matrix)
+
+        # Metadata goes first so count(), which is derived from vectors.bin,
+        # never points past the sidecar columns; _repair() drops the extra
+        # rows if we are interrupted before vectors.bin is written.
+        rows = [dict(m, key=k, document=d) for k, d, m in zip(ids, documents, metadatas)]
+        for name, column in self._strings.items():
+            column.append(r.get(name, "") for r in rows)
+        for name, column in self._ints.items():
+            column.append(int(r.get(name, -1)) for r in rows)
+
+        with open(self._norms_path, "ab") as f:
+            f.write(np.einsum("ij,ij->i", restored, restored).astype(np.float32).tobytes())
+        if scales is not None:
+            with open(self._scales_path, "ab") as f:
+                f.write(scales.tobytes())
+        with open(self._vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(stored).tobytes())
+
+        if self._ids_cache is not None:
+            self._ids_cache.update(ids)
+
+    def _rows_to_metadatas(self, rows: Optional[List[int]], total: int) -> List[Dict]:
+        # "key" and "document" are never part of the returned metadata, so they are not read
+        names = [name for name in self._strings if name not in ("key", "document")]
+        if rows is None:
+            strings = {name: self._strings[name].read(limit=total) for name in names}
+            ints = {name: col.read(total).tolist() for name, col in self._ints.items()}
+        else:
+            strings = {name: self._strings[name].take(rows, total) for name in names}
+            ints = {name: col.read(total)[rows].tolist() for name, col in self._ints.items()}
+        metadatas = []
+        for pos in range(total if rows is None else len(rows)):
+            m = {name: values[pos] for name, values in strings.items()}
+            m.update({name: values[pos] for name, values in ints.items()})
+            metadatas.append(m)
+        return metadatas
+
+    def get_metadatas(self) -> List[Dict]:
+        total = self.count()
+        if total == 0:
+            return []
+        return self._rows_to_metadatas(None, total)
+
+    def get_columns(self) -> Dict[str, List]:
+        total = self.count()
+        columns = {name: col.read(limit=total) for name, col in self._strings.items() if name not in ("key", "document")}
+        columns.update({name: col.read(total).tolist() for name, col in self._ints.items()})
+        return columns
+
+    def query(self, embedding, top_k: int = 5):
+        total = self.count()
+        if total == 0 or top_k <= 0:
+            return [], []
+        q = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        q_norm = float(q @ q)
+
+        vectors = np.memmap(self._vectors_path, dtype=self._np_dtype, mode="r", shape=(total, self.dim))
+        norms = np.memmap(self._norms_path, dtype=np.float32, mode="r", shape=(total,))
+        scales = None
+        if self.dtype == "int8":
+            scales = np.memmap(self._scales_path, dtype=np.float32, mode="r", shape=(total,))
+
+        best_idx = np.empty(0, dtype=np.int64)
+        best_dist = np.empty(0, dtype=np.float32)
+        for start in range(0, total, self.chunk_size):
+            end = min(start + self.chunk_size, total)
+            dots = vectors[start:end].astype(np.float32) @ q
+            if scales is not None:
+                dots *= scales[start:end]
+            dist = q_norm + norms[start:end] - 2.0 * dots
+
+            k = min(top_k, end - start)
+            part = np.argpartition(dist, k - 1)[:k]
+            best_idx = np.concatenate([best_idx, part + start])
+            best_dist = np.concatenate([best_dist, dist[part]])
+            if len(best_idx) > top_k:
+                keep = np.argpartition(best_dist, top_k - 1)[:top_k]
+                best_idx, best_dist = best_idx[keep], best_dist[keep]
+
+        order = np.argsort(best_dist, kind="stable")
+        rows = [int(r) for r in best_idx[order]]
+        distances = [max(float(d), 0.0) for d in best_dist[order]]
+        return self._rows_to_metadatas(rows, total), distances
+
+    def reset(self) -> None:
+        for fn in os.listdir(self.path):
+            if fn != "store.json":
+                os.remove(os.path.join(self.path, fn))
+        self._ids_cache = None
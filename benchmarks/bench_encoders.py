@@ -0,0 +1,90 @@
+# benchmarks/bench_encoders.py
+"""
+Measure encoder throughput (texts per second) on synthetic Roslynator issue
+documents and check each encoder's vectors against the reference
+all-MiniLM-L6-v2 SentenceTransformer output. Texts are fed in --chunk
+sized calls, as EmbeddingAgent does, so the figures match the pipeline.
+
+    python benchmarks/bench_encoders.py --texts 5000 --encoders default,multiprocess,onnx,quantized
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from agents.encoders import ENCODERS, build_encoder
+
+MESSAGES = [
+    "Remove unused using directive",
+    "Use 'var' instead of explicit type",
+    "Add braces to if-else",
+    "Make field read-only",
+    "Remove redundant empty line",
+    "Use expression-bodied member",
+    "Declare each attribute separately",
+    "Simplify boolean comparison",
+]
+
+
+def make_texts(n: int):
+    rnd = random.Random(0)
+    texts = []
+    for i in range(n):
+        rule = f"RCS{rnd.randint(1000, 1250)}"
+        path = f"/workspace/repo/src/Module{rnd.randint(1, 40)}/File{rnd.randint(1, 400)}.cs"
+        severity = rnd.choice(["info", "warning", "error"])
+        texts.append(
+            f"Issue {rule} in file {path} line {rnd.randint(1, 2000)}. "
+            f"Severity: {severity}. "
+            f"Message: {rnd.choice(MESSAGES)}"
+        )
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--chunk", type=int, default=4096, help="texts per encode() call (EmbeddingAgent default)")
+    parser.add_argument("--encoders", default=",".join(ENCODERS))
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    reference = build_encoder("default")
+    ref_vectors = reference.encode(texts, batch_size=args.batch)
+
+    print(f"{'encoder':<14}{'texts/s':>10}{'min cos':>10}{'mean cos':>10}{'tolerance':>11}  ok")
+    for kind in args.encoders.split(","):
+        try:
+            encoder = build_encoder(kind)
+        except Exception as e:
+            print(f"{kind:<14} unavailable: {e}")
+            continue
+        try:
+            # warm up; large enough to start a multi-process pool outside the timed run
+            warm = max(args.batch, getattr(encoder, "min_pool_texts", 0))
+            encoder.encode(texts[:warm], batch_size=args.batch)
+            start = time.perf_counter()
+            vectors = np.concatenate([
+                encoder.encode(texts[i:i + args.chunk], batch_size=args.batch)
+                for i in range(0, len(texts), args.chunk)
+            ])
+            elapsed = time.perf_counter() - start
+        finally:
+            encoder.close()
+
+        cos = np.einsum("ij,ij->i", vectors, ref_vectors) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(ref_vectors, axis=1)
+        )
+        ok = "yes" if cos.min() >= encoder.min_cosine else "NO"
+        print(f"{kind:<14}{len(texts) / elapsed:>10.1f}{cos.min():>10.5f}{cos.mean():>10.5f}"
+              f"{encoder.min_cosine:>11}  {ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_issue_memory.py
+"""
+Compare the memory held by N diagnostics in three representations:
+plain dicts (the old pipeline format), slotted Issue records and the
+column-oriented IssueBatch. Issues are built the way the Roslynator parser
+sees them: every file path and rule id arrives as a fresh string.
+
+    python benchmarks/bench_issue_memory.py --issues 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.issues import Issue, IssueBatch
+
+
+def raw_rows(n: int):
+    rnd = random.Random(0)
+    for _ in range(n):
+        # "".join builds a new string object per row, like a regex match group does
+        yield (
+            "".join(["/workspace/repo/src/Module", str(rnd.randint(1, 40)), "/File", str(rnd.randint(1, 400)), ".cs"]),
+            rnd.randint(1, 2000),
+            rnd.randint(1, 120),
+            "".join(["inf", "o"]),
+            "".join(["RCS", str(rnd.randint(1000, 1250))]),
+            "Remove unused using directive",
+        )
+
+
+def as_dicts(n):
+    return [
+        {"file": f, "line": l, "column": c, "severity": s, "id": r, "issue": m}
+        for f, l, c, s, r, m in raw_rows(n)
+    ]
+
+
+def as_issues(n):
+    return [Issue(f, l, c, s, r, m) for f, l, c, s, r, m in raw_rows(n)]
+
+
+def as_batch(n):
+    batch = IssueBatch()
+    for f, l, c, s, r, m in raw_rows(n):
+        batch.append(Issue(f, l, c, s, r, m))
+    return batch
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build(n)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'representation':<16}{'retained MB':>13}{'peak MB':>10}{'bytes/issue':>13}{'build s':>9}")
+    baseline = None
+    for name, build in (("dict", as_dicts), ("Issue", as_issues), ("IssueBatch", as_batch)):
+        current, peak, elapsed = measure(build, args.issues)
+        baseline = baseline or current
+        print(f"{name:<16}{current / 2**20:>13.1f}{peak / 2**20:>10.1f}{current / args.issues:>13.0f}{elapsed:>9.2f}"
+              f"  ({current / baseline:.0%} of dict)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_reports.py
+"""
+Time snapshot reports on synthetic runs: writing the Parquet snapshot,
+streaming JSONL/CSV/SARIF exports, aggregates and the run-to-run diff.
+
+    python benchmarks/bench_reports.py --issues 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.issues import Issue, IssueBatch
+from agents.reporting_agent import EXPORT_FORMATS, ReportingAgent
+from agents.snapshots import SnapshotStore
+
+MESSAGES = [
+    "Remove unused using directive",
+    "Use 'var' instead of explicit type",
+    "Add braces to if-else",
+    "Make field read-only",
+]
+
+
+def make_batch(n: int, seed: int) -> IssueBatch:
+    rnd = random.Random(seed)
+    batch = IssueBatch()
+    for _ in range(n):
+        batch.append(Issue(
+            f"/workspace/repo/src/Module{rnd.randint(1, 40)}/File{rnd.randint(1, 400)}.cs",
+            rnd.randint(1, 2000),
+            rnd.randint(1, 120),
+            rnd.choice(("info", "warning", "error")),
+            f"RCS{rnd.randint(1000, 1250)}",
+            f"{rnd.choice(MESSAGES)} (#{rnd.randint(1, 5000)})",
+        ))
+    return batch
+
+
+def timed(label, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    print(f"{label:<22}{time.perf_counter() - start:>8.2f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = SnapshotStore(os.path.join(workdir, "snapshots"))
+        previous, current = make_batch(args.issues, 1), make_batch(args.issues, 2)
+        timed("write snapshot", store.write, previous, "bench")
+        timed("write snapshot", store.write, current, "bench")
+
+        agent = ReportingAgent(snapshot_store=store)
+        for fmt in EXPORT_FORMATS:
+            out_path = os.path.join(workdir, f"issues.{fmt}")
+            timed(f"export {fmt}", agent.export, out_path)
+            print(f"{'':<22}{os.path.getsize(out_path) / 2**20:>8.1f} MB")
+        timed("aggregates", agent.aggregates)
+        timed("diff", agent.diff)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_startup.py
+"""
+Check how long main.py takes to reach its menu.
+
+Two measurements:
+  * `python -X importtime -c "import main"`: total import time of the entry
+    point, the slowest imports, and whether any heavy dependency
+    (chromadb, sentence_transformers, torch, openai) was loaded.
+  * wall time of `python main.py` answering "5" (Exit) at the menu.
+
+Exits non-zero when the menu takes longer than --budget-ms or a heavy
+dependency is imported before an option needs it.
+
+    python benchmarks/bench_startup.py --budget-ms 500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("chromadb", "sentence_transformers", "torch", "openai", "transformers")
+
+
+def import_profile():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # nested imports are indented by two spaces per level; keep that
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()[1:]))
+    return rows
+
+
+def menu_wall_time(runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "main.py"], cwd=REPO_ROOT, input="5\n",
+            capture_output=True, text=True, check=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="budget for reaching the menu and exiting")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = import_profile()
+    top_level = [r for r in rows if not r[2].startswith(" ")]
+    total_us = sum(r[0] for r in top_level)
+    heavy = sorted({r[2].strip().split(".")[0] for r in rows} & set(HEAVY_MODULES))
+
+    print(f"Total import time (interpreter + main): {total_us / 1000.0:.1f} ms")
+    print("Slowest imports (cumulative):")
+    for cumulative_us, _, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {cumulative_us / 1000.0:>8.1f} ms  {name.strip()}")
+    print(f"Heavy modules imported at startup: {', '.join(heavy) if heavy else 'none'}")
+
+    timings = menu_wall_time(args.runs)
+    median = statistics.median(timings)
+    print(f"Menu -> Exit wall time: median {median:.1f} ms, max {max(timings):.1f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    if heavy or median > args.budget_ms:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
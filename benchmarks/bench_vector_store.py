@@ -0,0 +1,131 @@
+# benchmarks/bench_vector_store.py
+"""
+Compare the Chroma and memory-mapped NumPy vector stores on synthetic
+384-d unit vectors: ingest rate, query latency and peak RSS.
+
+Each backend runs in its own subprocess so RSS numbers do not mix.
+
+    python benchmarks/bench_vector_store.py --rows 200000 --queries 200
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKENDS = ("chroma", "numpy-float16", "numpy-int8")
+# Roslynator-sized messages, so documents are as long as EmbeddingAgent's (~200 bytes)
+MESSAGES = (
+    "Remove unused using directive; the namespace is not referenced anywhere in this compilation unit",
+    "Use 'var' instead of explicit type when the type is obvious from the right-hand side of the assignment",
+    "Add braces to if-else statement that spans multiple lines to make the control flow explicit",
+    "Make field read-only because it is only assigned in the declaration or in the constructor",
+)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _make_store(backend: str, workdir: str):
+    if backend == "chroma":
+        from chromadb import Client
+        from chromadb.config import Settings
+        from agents.vector_store import ChromaVectorStore
+        client = Client(Settings(persist_directory=workdir, is_persistent=True, anonymized_telemetry=False))
+        return ChromaVectorStore(client, "bench")
+    from agents.vector_store import NumpyVectorStore
+    dtype = backend.split("-", 1)[1]
+    return NumpyVectorStore(root_dir=workdir, collection_name="bench", dtype=dtype)
+
+
+def run_worker(backend: str, rows: int, queries: int, batch: int, top_k: int) -> dict:
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as workdir:
+        store = _make_store(backend, workdir)
+        baseline_rss = _peak_rss_mb()
+
+        start = time.perf_counter()
+        for offset in range(0, rows, batch):
+            n = min(batch, rows - offset)
+            vecs = rng.standard_normal((n, 384)).astype(np.float32)
+            vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+            ids = [f"R{offset + i}:file{(offset + i) % 500}.cs:{i}" for i in range(n)]
+            metas = [
+                {"file": f"/repo/src/file{(offset + i) % 500}.cs", "line": i, "column": 1,
+                 "severity": "info", "id": f"RCS{(offset + i) % 200:04d}",
+                 "issue": f"{MESSAGES[(offset + i) % len(MESSAGES)]} (#{offset + i})"}
+                for i in range(n)
+            ]
+            documents = [
+                f"Issue {m['id']} in file {m['file']} line {m['line']}. Severity: {m['severity']}. Message: {m['issue']}"
+                for m in metas
+            ]
+            store.add(ids=ids, documents=documents, metadatas=metas, embeddings=vecs)
+        ingest_s = time.perf_counter() - start
+
+        qs = rng.standard_normal((queries, 384)).astype(np.float32)
+        qs /= np.linalg.norm(qs, axis=1, keepdims=True)
+        store.query(qs[0], top_k=top_k)  # warm up
+        latencies = []
+        for q in qs:
+            t0 = time.perf_counter()
+            store.query(q, top_k=top_k)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+        latencies.sort()
+
+        disk = sum(
+            os.path.getsize(os.path.join(root, fn))
+            for root, _, files in os.walk(workdir) for fn in files
+        )
+
+    return {
+        "backend": backend,
+        "rows": rows,
+        "ingest_rows_per_s": round(rows / ingest_s, 1),
+        "query_p50_ms": round(latencies[len(latencies) // 2], 3),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_growth_mb": round(_peak_rss_mb() - baseline_rss, 1),
+        "disk_mb": round(disk / (1024 * 1024), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.rows, args.queries, args.batch, args.top_k)))
+        return
+
+    print(f"{'backend':<16}{'ingest/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'RSS MB':>10}{'+RSS MB':>10}{'disk MB':>10}")
+    for backend in args.backends.split(","):
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", backend,
+               "--rows", str(args.rows), "--queries", str(args.queries),
+               "--batch", str(args.batch), "--top-k", str(args.top_k)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{backend:<16} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.returncode}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{r['backend']:<16}{r['ingest_rows_per_s']:>12}{r['query_p50_ms']:>10}{r['query_p95_ms']:>10}"
+              f"{r['peak_rss_mb']:>10}{r['rss_growth_mb']:>10}{r['disk_mb']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,70 @@
 import os
-from chromadb import Client
-from chromadb.config import Settings
-
-# --- Agents imports ---
-from agents.repo_manager import RepoManager
-from agents.roslynator_agent import RoslynatorAgent
-from agents.embedding_agent import EmbeddingAgent
-from agents.query_agent import QueryAgent
-from agents.refactor_agent import RefactorAgent
-from agents.approval_agent import ApprovalAgent
-from agents.reporting_agent import ReportingAgent
+
+# Agents and their heavy dependencies (chromadb, sentence_transformers/torch,
+# openai) are imported inside the menu options that need them, so reaching
+# the menu stays fast. See benchmarks/bench_startup.py.
 
 # --- Globals ---
 DB_DIR = "chroma_db"
+VECTOR_DB_DIR = "vector_db"
+SNAPSHOT_DIR = "snapshots"
 COLLECTION_NAME = "roslynator_issues"
+# "chroma" (default) or "numpy" for the memory-mapped index
+VECTOR_BACKEND = os.environ.get("VECTOR_BACKEND", "chroma").lower()
+# "float16" or "int8", numpy backend only
+VECTOR_DTYPE = os.environ.get("VECTOR_DTYPE", "float16").lower()
+# "default", "multiprocess", "onnx", "onnx-int8" or "quantized"
+EMBEDDING_ENCODER = os.environ.get("EMBEDDING_ENCODER", "default").lower()
+
+_SHARED = {}
+
+
+def get_chroma_client():
+    """Shared Chroma client, created on first access."""
+    if "chroma_client" not in _SHARED:
+        from chromadb import Client
+        from chromadb.config import Settings
+        try:
+            _SHARED["chroma_client"] = Client(Settings(persist_directory=DB_DIR))
+        except ValueError:
+            _SHARED["chroma_client"] = Client(Settings())
+    return _SHARED["chroma_client"]
+
+
+def build_vector_store(backend=VECTOR_BACKEND, collection_name=COLLECTION_NAME):
+    if backend == "numpy":
+        from agents.vector_store import NumpyVectorStore
+        return NumpyVectorStore(root_dir=VECTOR_DB_DIR, collection_name=collection_name, dtype=VECTOR_DTYPE)
+    from agents.vector_store import ChromaVectorStore
+    return ChromaVectorStore(get_chroma_client(), collection_name)
+
+
+def get_vector_store():
+    if "vector_store" not in _SHARED:
+        _SHARED["vector_store"] = build_vector_store()
+    return _SHARED["vector_store"]
+
+
+def get_encoder():
+    if "encoder" not in _SHARED:
+        from agents.encoders import build_encoder
+        _SHARED["encoder"] = build_encoder(EMBEDDING_ENCODER)
+    return _SHARED["encoder"]
 
-# Initialize shared Chroma client
-try:
-    SHARED_CHROMA_CLIENT = Client(Settings(persist_directory=DB_DIR))
-except ValueError:
-    SHARED_CHROMA_CLIENT = Client(Settings())
 
+def get_snapshot_store():
+    if "snapshot_store" not in _SHARED:
+        from agents.snapshots import SnapshotStore
+        _SHARED["snapshot_store"] = SnapshotStore(SNAPSHOT_DIR)
+    return _SHARED["snapshot_store"]
 
-def is_chromadb_ready(client, collection_name=COLLECTION_NAME) -> bool:
-    try:
-        col = client.get_collection(collection_name)
-        return col.count() > 0
-    except Exception:
-        return False
+
+def is_chromadb_ready(store=None) -> bool:
+    return (store or get_vector_store()).count() > 0
 
 
 def main_menu():
-    repo_manager = RepoManager()
+    repo_manager = None
     query_agent = None
     repo_path = None  # track last cloned repo path
 
@@ -51,12 +84,21 @@ def main_menu():
                 print("Repository URL is required.")
                 continue
 
+            if repo_manager is None:
+                from agents.repo_manager import RepoManager
+                repo_manager = RepoManager()
+
             repo_path = repo_manager.clone_repo(repo_url)
             cs_files = repo_manager.list_csharp_files(repo_path)
             if not cs_files:
                 print("No C# files found in the repository.")
                 continue
 
+            from agents.roslynator_agent import RoslynatorAgent
+            from agents.embedding_agent import EmbeddingAgent
+            from agents.issues import IssueBatch
+            from agents.query_agent import QueryAgent
+
             roslynator_agent = RoslynatorAgent(
                 repo_path=repo_path,
                 output_dir=os.path.join(repo_path, "analysis")  # only for logs
@@ -66,21 +108,31 @@ def main_menu():
             if not issues:
                 print("Roslynator analysis failed or no issues found.")
                 continue
+            # absolute paths for both the vector store and the snapshot
+            issues = IssueBatch.from_issues(issues).resolve_paths(repo_path)
 
             embedding_agent = EmbeddingAgent(
                 issues=issues,
-                chroma_client=SHARED_CHROMA_CLIENT,
-                repo_root=repo_path
+                vector_store=get_vector_store(),
+                repo_root=repo_path,
+                encoder=get_encoder()
             )
             embedding_agent.store_embeddings()
+            get_snapshot_store().write(issues, os.path.basename(repo_path), repo_path)
 
-            query_agent = QueryAgent(chroma_client=SHARED_CHROMA_CLIENT, collection_name=COLLECTION_NAME)
+            query_agent = QueryAgent(
+                vector_store=get_vector_store(), collection_name=COLLECTION_NAME, encoder=get_encoder(),
+                snapshot_store=get_snapshot_store(),
+            )
             print("Clone and analysis complete.")
 
         elif choice == "2":
             if query_agent is None:
-                if is_chromadb_ready(SHARED_CHROMA_CLIENT):
-                    query_agent = QueryAgent(chroma_client=SHARED_CHROMA_CLIENT)
+                if is_chromadb_ready():
+                    from agents.query_agent import QueryAgent
+                    query_agent = QueryAgent(
+                        vector_store=get_vector_store(), encoder=get_encoder(), snapshot_store=get_snapshot_store(),
+                    )
                 else:
                     print("No ChromaDB data found. Please run clone and analysis first.")
                     continue
@@ -97,29 +149,57 @@ def main_menu():
 
             print(f"\nTop {len(results)} matching issues:")
             for i, res in enumerate(results, 1):
-                print(f"{i}. File: {res.get('file')}\n   Issue: {res.get('issue')}\n")
+                print(f"{i}. File: {res.file}\n   Issue: {res.issue}\n")
 
         elif choice == "3":
-            if not is_chromadb_ready(SHARED_CHROMA_CLIENT):
-                print("No ChromaDB data found. Please run clone and analysis first.")
+            print("  a. List all stored issues")
+            print("  b. Summary by rule, severity, file and directory (latest run)")
+            print("  c. Changes since the previous run")
+            print("  d. Export latest run (JSONL, CSV or SARIF)")
+            report_choice = input("Select a report [a-d] (default a): ").strip().lower() or "a"
+
+            from agents.reporting_agent import ReportingAgent
+            if report_choice == "a":
+                if not is_chromadb_ready():
+                    print("No ChromaDB data found. Please run clone and analysis first.")
+                    continue
+                reporting_agent = ReportingAgent(vector_store=get_vector_store())
+                reporting_agent.show_all()
                 continue
-        
-            reporting_agent = ReportingAgent(chroma_client=SHARED_CHROMA_CLIENT)
-            reporting_agent.show_all()
+
+            reporting_agent = ReportingAgent(snapshot_store=get_snapshot_store())
+            try:
+                if report_choice == "b":
+                    reporting_agent.show_summary()
+                elif report_choice == "c":
+                    reporting_agent.show_diff()
+                elif report_choice == "d":
+                    out_path = input("Output file (.jsonl, .csv or .sarif): ").strip()
+                    if not out_path:
+                        print("Export cancelled.")
+                        continue
+                    reporting_agent.export(out_path)
+                else:
+                    print("Invalid report option.")
+            except (FileNotFoundError, ValueError) as e:
+                print(f"[ReportingAgent] {e}")
 
         elif choice == "4":
-            if not is_chromadb_ready(SHARED_CHROMA_CLIENT):
+            if not is_chromadb_ready():
                 print("No ChromaDB data found. Please run clone and analysis first.")
                 continue
 
+            from agents.refactor_agent import RefactorAgent
             refactor_agent = RefactorAgent(
-                chroma_client=SHARED_CHROMA_CLIENT,
+                vector_store=get_vector_store(),
                 repo_root=repo_path
             )
             refactor_agent.approval_and_refactor_loop()
 
         elif choice == "5":
             print("Exiting. Goodbye!")
+            if "encoder" in _SHARED:
+                _SHARED["encoder"].close()
             break
 
         else:
@@ -0,0 +1,458 @@
+# server.py
+"""
+Long-running A2A agent server. Keeps the encoder, vector store and repo
+indexes warm and exposes the agents over HTTP on a TCP port or Unix socket.
+
+    python server.py --port 8765
+    python server.py --unix-socket /tmp/a2a-agents.sock
+
+Endpoints (JSON request bodies, JSON responses):
+  GET  /health       status, warm state, issue count, per-endpoint latency
+  POST /analyze      {"repo_url"}             clone + Roslynator + embed, streamed as NDJSON events
+  POST /search       {"query", "top_k"?}      QueryAgent.search_issues
+  GET  /report       all stored issues, streamed as NDJSON
+  POST /report/summary {"run"?, "top"?}       per rule/severity/file/directory counts from the latest snapshot
+  POST /propose-fix  {"file", "issue", "repo_root"?}
+  POST /apply-fix    {"file", "fixed_code", "repo_root"?}
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import main as cli
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+def _is_local_host(value: str) -> bool:
+    try:
+        return urlsplit(f"//{value}").hostname in LOCAL_HOSTS
+    except ValueError:
+        return False
+
+
+def _int_param(body, name, default, minimum=1, maximum=1000):
+    value = body.get(name, default)
+    # bool is an int subclass; "true" is not a sensible count
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise HTTPError(400, f"'{name}' must be an integer")
+    try:
+        value = int(value)
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be an integer")
+    if not minimum <= value <= maximum:
+        raise HTTPError(400, f"'{name}' must be between {minimum} and {maximum}")
+    return value
+
+
+class AgentServer:
+    def __init__(self, workers: int = 4, check_host: bool = True):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent")
+        self.started = time.time()
+        self.latencies = defaultdict(lambda: deque(maxlen=1000))
+        self.in_flight = 0
+        # Analysis and fix application mutate the store or the repo; searches
+        # and reports run concurrently with each other.
+        self.write_lock = asyncio.Lock()
+        self._init_lock = threading.RLock()
+        self._repo_manager = None
+        self._query_agent = None
+        self._reporting_agent = None
+        self._refactor_agents = {}
+        self.repo_path = None
+        # Host is meaningless on a Unix socket, which browsers cannot reach anyway
+        self.check_host = check_host
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/search"): self.search,
+            ("GET", "/report"): self.report,
+            ("POST", "/report/summary"): self.report_summary,
+            ("POST", "/propose-fix"): self.propose_fix,
+            ("POST", "/apply-fix"): self.apply_fix,
+        }
+
+    # ---------- shared warm state ----------
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def _vector_store(self):
+        with self._init_lock:
+            return cli.get_vector_store()
+
+    def _encoder(self):
+        with self._init_lock:
+            return cli.get_encoder()
+
+    def _get_query_agent(self):
+        with self._init_lock:
+            if self._query_agent is None:
+                from agents.query_agent import QueryAgent
+                self._query_agent = QueryAgent(
+                    collection_name=cli.COLLECTION_NAME,
+                    vector_store=self._vector_store(),
+                    encoder=self._encoder(),
+                    snapshot_store=cli.get_snapshot_store(),
+                )
+            return self._query_agent
+
+    def _get_reporting_agent(self):
+        # Listing issues needs no encoder, so a report never loads the model.
+        with self._init_lock:
+            if self._reporting_agent is None:
+                from agents.reporting_agent import ReportingAgent
+                self._reporting_agent = ReportingAgent(
+                    collection_name=cli.COLLECTION_NAME, vector_store=self._vector_store()
+                )
+            return self._reporting_agent
+
+    def _get_repo_manager(self):
+        with self._init_lock:
+            if self._repo_manager is None:
+                from agents.repo_manager import RepoManager
+                self._repo_manager = RepoManager()
+            return self._repo_manager
+
+    def _get_refactor_agent(self, repo_root=None):
+        # Only repos this server cloned may be read or written: the analyzed
+        # repo, or another checkout under the RepoManager workspace.
+        root = repo_root or self.repo_path
+        if not root:
+            raise HTTPError(400, "'repo_root' is required until a repo has been analyzed")
+        root = os.path.realpath(root)
+        base = os.path.realpath(self._get_repo_manager().base_path)
+        analyzed = os.path.realpath(self.repo_path) if self.repo_path else None
+        if root != analyzed and (root == base or os.path.commonpath([base, root]) != base):
+            raise HTTPError(403, f"Repo root is not a repo cloned by this server: {root}")
+        if not os.path.isdir(root):
+            raise HTTPError(404, f"Repo root not found: {root}")
+        with self._init_lock:
+            if root not in self._refactor_agents:
+                from agents.refactor_agent import RefactorAgent
+                self._refactor_agents[root] = RefactorAgent(vector_store=self._vector_store(), repo_root=root)
+            return self._refactor_agents[root]
+
+    async def warm_up(self):
+        start = time.perf_counter()
+        agent = await self._run(self._get_query_agent)
+        await self._run(agent.encoder.encode, ["warm up"])
+        count = await self._run(agent.vector_store.count)
+        print(f"[AgentServer] Warm in {time.perf_counter() - start:.1f}s ({count} issues indexed)")
+
+    # ---------- handlers ----------
+    async def health(self, body):
+        latency = {}
+        for path, samples in self.latencies.items():
+            ordered = sorted(samples)
+            latency[path] = {
+                "count": len(ordered),
+                "p50_ms": round(statistics.median(ordered), 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                "max_ms": round(ordered[-1], 2),
+            }
+        warm = {name: name in cli._SHARED for name in ("vector_store", "encoder")}
+        issues = await self._run(self._vector_store().count) if warm["vector_store"] else None
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 1),
+            "in_flight": self.in_flight,
+            "warm": warm,
+            "issues": issues,
+            "repo_path": self.repo_path,
+            "latency": latency,
+        }
+
+    async def analyze(self, body):
+        repo_url = (body.get("repo_url") or "").strip()
+        if not repo_url:
+            raise HTTPError(400, "'repo_url' is required")
+        return self._analyze_stream(repo_url)
+
+    async def _analyze_stream(self, repo_url):
+        from agents.roslynator_agent import RoslynatorAgent
+        from agents.embedding_agent import EmbeddingAgent
+        from agents.issues import IssueBatch
+
+        async with self.write_lock:
+            repo_manager = self._get_repo_manager()
+            yield {"event": "cloning", "repo_url": repo_url}
+            repo_path = await self._run(repo_manager.clone_repo, repo_url)
+            cs_files = await self._run(repo_manager.list_csharp_files, repo_path)
+            yield {"event": "cloned", "repo_path": repo_path, "cs_files": len(cs_files)}
+            if not cs_files:
+                yield {"event": "done", "ok": False, "error": "No C# files found in the repository."}
+                return
+
+            yield {"event": "analyzing"}
+            roslynator_agent = RoslynatorAgent(repo_path=repo_path, output_dir=os.path.join(repo_path, "analysis"))
+            issues = await self._run(roslynator_agent.run_analysis)
+            if not issues:
+                yield {"event": "done", "ok": False, "error": "Roslynator analysis failed or no issues found."}
+                return
+            # absolute paths for both the vector store and the snapshot
+            batch = await self._run(IssueBatch.from_issues, issues)
+            issues = await self._run(batch.resolve_paths, repo_path)
+            yield {"event": "analyzed", "issues": len(issues)}
+
+            yield {"event": "embedding"}
+            embedding_agent = EmbeddingAgent(
+                issues=issues,
+                vector_store=self._vector_store(),
+                repo_root=repo_path,
+                encoder=self._encoder(),
+            )
+            inserted = await self._run(embedding_agent.store_embeddings)
+            snapshot = await self._run(
+                cli.get_snapshot_store().write, issues, os.path.basename(repo_path), repo_path
+            )
+            yield {"event": "snapshot", "path": snapshot}
+            self.repo_path = repo_path
+            # clone_repo reuses an existing checkout, but its files may have changed
+            # since the refactor agent indexed them; drop it (keyed by realpath, as
+            # in _get_refactor_agent) so the next fix request rebuilds the index
+            with self._init_lock:
+                self._refactor_agents.pop(os.path.realpath(repo_path), None)
+            yield {"event": "done", "ok": True, "repo_path": repo_path, "issues": len(issues), "inserted": inserted}
+
+    async def search(self, body):
+        query = (body.get("query") or "").strip()
+        if not query:
+            raise HTTPError(400, "'query' is required")
+        top_k = _int_param(body, "top_k", 5)
+        agent = await self._run(self._get_query_agent)
+        results = await self._run(agent.search_issues, query, top_k)
+        return {"query": query, "results": [r.to_dict() for r in results]}
+
+    async def report(self, body):
+        agent = await self._run(self._get_reporting_agent)
+        issues = await self._run(agent.query_agent._get_issue_batch)
+        return self._report_stream(issues)
+
+    async def _report_stream(self, issues):
+        yield {"event": "summary", "total": len(issues)}
+        for issue in issues:
+            yield issue.to_dict()
+
+    async def report_summary(self, body):
+        from agents.reporting_agent import ReportingAgent
+
+        agent = ReportingAgent(snapshot_store=cli.get_snapshot_store())
+        top = _int_param(body, "top", 20)
+        run = body.get("run")
+        if run is not None and (not isinstance(run, str) or not run):
+            raise HTTPError(400, "'run' must be a snapshot path returned by /analyze")
+        try:
+            # unknown runs are rejected before any file is opened
+            agg = await self._run(agent.aggregates, run, top)
+        except FileNotFoundError as e:
+            raise HTTPError(404, str(e))
+        return {
+            name: value.to_dict(orient="records") if hasattr(value, "to_dict") else value
+            for name, value in agg.items()
+        }
+
+    @staticmethod
+    def _resolve_source_file(agent, file_hint):
+        file_path = agent._resolve_file(str(file_hint))
+        if not file_path or not os.path.isfile(file_path):
+            raise HTTPError(404, f"Invalid file path: {file_hint}")
+        # realpath on both sides so symlinks cannot point outside the repo
+        real, root = os.path.realpath(file_path), os.path.realpath(agent.repo_root)
+        if os.path.commonpath([root, real]) != root:
+            raise HTTPError(403, f"File is outside the repo root: {file_path}")
+        if not real.lower().endswith(".cs"):
+            raise HTTPError(403, f"Only C# source files can be read or changed: {file_path}")
+        return real
+
+    async def propose_fix(self, body):
+        file_hint, description = body.get("file"), body.get("issue")
+        if not file_hint or not description:
+            raise HTTPError(400, "'file' and 'issue' are required")
+        agent = await self._run(self._get_refactor_agent, body.get("repo_root"))
+        file_path = await self._run(self._resolve_source_file, agent, file_hint)
+        proposed = await self._run(agent.propose_fix, file_path, description)
+        return {"file": file_path, "proposed_fix": proposed}
+
+    async def apply_fix(self, body):
+        file_hint, fixed_code = body.get("file"), body.get("fixed_code")
+        if not file_hint or fixed_code is None:
+            raise HTTPError(400, "'file' and 'fixed_code' are required")
+        agent = await self._run(self._get_refactor_agent, body.get("repo_root"))
+        file_path = await self._run(self._resolve_source_file, agent, file_hint)
+        async with self.write_lock:
+            await self._run(agent.apply_fix, file_path, fixed_code)
+        return {"file": file_path, "applied": True}
+
+    # ---------- HTTP plumbing ----------
+    def _check_request(self, method, headers):
+        """
+        Refuse requests a web page could forge: a non-local Origin, a
+        non-local Host (DNS rebinding), or a POST that is not JSON and so
+        would skip the browser's CORS preflight.
+        """
+        origin = headers.get("origin")
+        if origin is not None:
+            try:
+                local_origin = urlsplit(origin).hostname in LOCAL_HOSTS
+            except ValueError:
+                local_origin = False
+            if not local_origin:
+                return 403, f"Origin not allowed: {origin}"
+        if self.check_host and not _is_local_host(headers.get("host", "")):
+            return 403, f"Host not allowed: {headers.get('host', '')}"
+        if method == "POST":
+            content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+            if content_type != "application/json":
+                return 415, "Content-Type must be application/json"
+        return None
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                raw = await reader.readexactly(length) if length else b""
+            except (ValueError, asyncio.IncompleteReadError):
+                await self._send_json(writer, 400, {"error": "Malformed request"})
+                return
+            rejected = self._check_request(method.upper(), headers)
+            if rejected:
+                await self._send_json(writer, rejected[0], {"error": rejected[1]})
+                return
+            await self.dispatch(method.upper(), target.split("?", 1)[0], raw, writer)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, raw, writer):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known = any(p == path for _, p in self.routes)
+            status = 405 if known else 404
+            await self._send_json(writer, status, {"error": f"{method} {path} not supported"})
+            return
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            try:
+                body = json.loads(raw) if raw else {}
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "Request body must be a JSON object")
+                result = await handler(body)
+            except json.JSONDecodeError as e:
+                await self._send_json(writer, 400, {"error": f"Invalid JSON: {e}"})
+                return
+            except HTTPError as e:
+                await self._send_json(writer, e.status, {"error": e.message})
+                return
+            except Exception as e:
+                print(f"[AgentServer] {method} {path} failed: {e!r}")
+                await self._send_json(writer, 500, {"error": str(e)})
+                return
+
+            if isinstance(result, dict):
+                await self._send_json(writer, 200, result)
+            else:
+                await self._send_stream(writer, result)
+        finally:
+            self.in_flight -= 1
+            self.latencies[path].append((time.perf_counter() - start) * 1000.0)
+
+    async def _send_head(self, writer, status, headers):
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        lines.append("Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send_json(self, writer, status, payload):
+        data = json.dumps(payload, default=str).encode("utf-8")
+        await self._send_head(writer, status, {"Content-Type": "application/json", "Content-Length": len(data)})
+        writer.write(data)
+        await writer.drain()
+
+    async def _send_stream(self, writer, events):
+        await self._send_head(writer, 200, {"Content-Type": "application/x-ndjson", "Transfer-Encoding": "chunked"})
+        try:
+            async for event in events:
+                await self._write_chunk(writer, event)
+        except Exception as e:
+            # headers are already out, so report the failure in-band
+            print(f"[AgentServer] Stream failed: {e!r}")
+            await self._write_chunk(writer, {"event": "error", "error": str(e)})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _write_chunk(self, writer, event):
+        data = (json.dumps(event, default=str) + "\n").encode("utf-8")
+        writer.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        await writer.drain()
+
+
+async def serve(args):
+    agent_server = AgentServer(workers=args.workers, check_host=not args.unix_socket)
+    if not args.no_warm:
+        await agent_server.warm_up()
+
+    if args.unix_socket:
+        if os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+        server = await asyncio.start_unix_server(agent_server.handle, path=args.unix_socket)
+        where = f"unix:{args.unix_socket}"
+    else:
+        server = await asyncio.start_server(agent_server.handle, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"[AgentServer] Listening on {where}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the A2A refactor agents over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=4, help="threads running blocking agent calls")
+    parser.add_argument("--no-warm", action="store_true", help="skip loading the model and store at startup")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n[AgentServer] Shutting down.")
+    finally:
+        if "encoder" in cli._SHARED:
+            cli._SHARED["encoder"].close()
+
+
+if __name__ == "__main__":
+    main()